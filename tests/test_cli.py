@@ -156,3 +156,149 @@ def test_batch_with_empty_file(tmp_path: Path):
 
     assert result.exit_code == 0
     assert result.output == f"Converting {input_file.name}\nWarning: File is empty\n"
+
+
+@pytest.mark.parametrize("short_opts", [True, False])
+@pytest.mark.parametrize(
+    ("order", "weighted", "expected"),
+    [
+        ("lexical", False, "bar|foo\n"),
+        ("lexical", True, "bar|foo\n"),
+        ("frequency", False, "foo|bar\n"),
+        ("frequency", True, "foo|bar\n"),
+    ],
+)
+def test_convert_order(order: str, weighted: bool, expected: str, short_opts: bool):
+    args = ["convert", "-r" if short_opts else "--order", order]
+
+    if weighted:
+        args.append("-w" if short_opts else "--weighted")
+        input_data = "foo\t1\nbar\t2\nfoo\nfoo"  # Values without a weight count as 1
+    else:
+        input_data = "foo\nbar\nfoo"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, args, input_data)
+
+    assert result.exit_code == 0
+    assert result.output == expected
+
+
+@pytest.mark.parametrize("weight", ["bar", "nan", "inf", "-1"])
+def test_convert_invalid_weight(weight: str):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["convert", "--weighted"], f"foo\t{weight}")
+
+    assert result.exit_code == 1
+    assert result.output == f'Error: Invalid weight "{weight}" for value "foo"\n'
+
+
+@pytest.mark.parametrize(("order", "expected"), [("lexical", "bar|foo\n"), ("frequency", "foo|bar\n")])
+def test_batch_order(tmp_path: Path, order: str, expected: str):
+    input_file = tmp_path / "in.txt"
+    input_file.write_text("foo\t5\nbar\t1", encoding="utf8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["batch", "--order", order, "--weighted", str(input_file)])
+
+    assert result.exit_code == 0
+    assert (tmp_path / "in.triex.txt").read_text(encoding="utf8") == expected
+
+
+@pytest.mark.parametrize("short_opts", [True, False])
+@pytest.mark.parametrize("show_prefixes", [True, False])
+@pytest.mark.parametrize("delimiter", [None, "::"])
+def test_diff(tmp_path: Path, delimiter: t.Optional[str], show_prefixes: bool, short_opts: bool):
+    old_file = tmp_path / "old.txt"
+    old_file.write_text((delimiter or "\n").join(["foo", "foobar", "baz"]), encoding="utf8")
+    new_file = tmp_path / "new.txt"
+    new_file.write_text((delimiter or "\n").join(["foo", "foobat", "baz", "qux"]), encoding="utf8")
+
+    args = ["diff"]
+
+    if delimiter is not None:
+        args.extend(["-d" if short_opts else "--delimiter", delimiter])
+
+    if show_prefixes:
+        args.append("-p" if short_opts else "--prefixes")
+
+    args.extend([str(old_file), str(new_file)])
+
+    runner = CliRunner()
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0
+    assert result.output == ("^\n^fooba\n" if show_prefixes else "-foobar\n+foobat\n+qux\n")
+
+
+def test_diff_weighted(tmp_path: Path):
+    old_file = tmp_path / "old.txt"
+    old_file.write_text("foo\t1\nbar\t2", encoding="utf8")
+    new_file = tmp_path / "new.txt"
+    new_file.write_text("foo\t3\nbar\t2\nbaz", encoding="utf8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["diff", "--weighted", str(old_file), str(new_file)])
+
+    assert result.exit_code == 0
+    assert result.output == "+baz\n~foo\n"
+
+
+@pytest.mark.parametrize("option", [["-b"], ["-c"], ["-n"], ["-r", "frequency"]])
+def test_diff_rejects_pattern_options(tmp_path: Path, option: list[str]):
+    input_file = tmp_path / "in.txt"
+    input_file.write_text("foo", encoding="utf8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["diff", *option, str(input_file), str(input_file)])
+
+    assert result.exit_code == 2
+    assert "No such option" in result.output
+    assert option[0] in result.output
+
+
+def test_diff_help_omits_pattern_options():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["diff", "--help"])
+
+    assert result.exit_code == 0
+    assert all(opt not in result.output for opt in ["--boundary", "--capture", "--non-capture", "--order"])
+    assert all(opt in result.output for opt in ["--delimiter", "--weighted"])
+
+
+def test_diff_with_empty_file(tmp_path: Path):
+    old_file = tmp_path / "old.txt"
+    old_file.touch()
+    new_file = tmp_path / "new.txt"
+    new_file.write_text("foo\t2\nbar\t1", encoding="utf8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["diff", "--weighted", str(old_file), str(new_file)])
+
+    assert result.exit_code == 0
+    assert result.output == "+bar\n+foo\n"
+
+
+STATS_OUTPUT = "members: 5\nnodes: 11\ndepth: 6\nlength: 21\ngroups: 1\nnesting: 1\nbranching: 0=4, 1=5, 2=3\n"
+
+
+def test_convert_dry_run(raw_values: list[str]):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["convert", "--dry-run"], "\n".join(raw_values))
+
+    assert result.exit_code == 0
+    assert result.output == STATS_OUTPUT
+
+
+def test_batch_dry_run(tmp_path: Path, raw_values: list[str]):
+    input_files = [tmp_path / "in1.txt", tmp_path / "in2.txt"]
+
+    for input_file in input_files:
+        input_file.write_text("\n".join(raw_values), encoding="utf8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["batch", "--dry-run", *[str(f) for f in input_files]])
+
+    assert result.exit_code == 0
+    assert result.output == "".join(f"Converting {f.name}\nfile: {f.name}\n{STATS_OUTPUT}" for f in input_files)
+    assert not any(f.with_name(f"{f.stem}.triex{f.suffix}").exists() for f in input_files)
@@ -1,12 +1,14 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,protected-access
 
 from contextlib import nullcontext as does_not_raise
+import copy
+import pickle
 import re
 import typing as t
 
 import pytest
 
-from triex.triex import Regex, Trie
+from triex.triex import Regex, Trie, TrieDiff, TrieStats
 
 
 @pytest.mark.parametrize("values", [None, "foo", [], ["foo", "bar", "foo"]])
@@ -24,6 +26,170 @@ def test_trie_add(values: t.Optional[str | list[str]]):
     assert trie.members == sorted(expected)
 
 
+@pytest.mark.parametrize(
+    ("weights", "expected", "context"),
+    [
+        (None, (2, 1), does_not_raise()),
+        ([1, 2, 3], (4, 2), does_not_raise()),
+        ([1, 2], None, pytest.raises(ValueError, match=r"Expected 3 weight\(s\), got 2")),
+        ([1, -1, 1], None, pytest.raises(ValueError, match=r"Weights cannot be negative")),
+        ([1, float("nan"), 1], None, pytest.raises(ValueError, match=r"Weights must be finite")),
+        ([1, float("inf"), 1], None, pytest.raises(ValueError, match=r"Weights must be finite")),
+    ],
+)
+def test_trie_add_weights(
+    weights: t.Optional[list[float]], expected: t.Optional[tuple[int, int]], context: t.ContextManager
+):
+    trie = Trie()
+
+    with context:
+        trie.add(["foo", "bar", "foo"], weights)
+
+    if expected is not None:
+        assert (trie.weight("foo"), trie.weight("bar")) == expected
+
+
+def test_trie_add_weights_accumulate():
+    trie = Trie("foo")
+    trie.add("foo", 2)
+    trie.add("foo", 3)
+    trie.add(["foo", "bar"])
+
+    assert trie.weight("foo") == 7
+    assert trie.weight("bar") == 1
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, lambda trie: pickle.loads(pickle.dumps(trie))])
+def test_trie_weights_survive_copy(clone: t.Callable[[Trie], Trie]):
+    trie = Trie(["foo", "bar"], weights=[1, 9])
+    cloned = clone(trie)
+
+    assert cloned.weight("bar") == 9
+    assert cloned.to_regex(order="frequency") == "bar|foo"
+    assert trie.diff(cloned) == TrieDiff([], [], [], [])
+
+
+def test_trie_add_weights_skips_invalid():
+    trie = Trie([None, "foo"], weights=[5, 3])  # type:ignore
+    assert trie.weight() == 3
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "expected"),
+    [
+        (["foo", "bar"], ["bar", "foo"], TrieDiff([], [], [], [])),
+        ([], ["foo"], TrieDiff(["foo"], [], [""], [])),
+        (
+            ["foo", "foobar", "baz"],
+            ["foo", "foobat", "baz", "qux"],
+            TrieDiff(["foobat", "qux"], ["foobar"], ["", "fooba"], []),
+        ),
+        (["foo", "foobar"], ["foobar"], TrieDiff([], ["foo"], ["foo"], [])),
+        (["foo"], ["foo", "foobar", "foobaz"], TrieDiff(["foobar", "foobaz"], [], ["foo"], [])),
+    ],
+)
+def test_trie_diff(old: list[str], new: list[str], expected: TrieDiff):
+    assert Trie(old).diff(Trie(new)) == expected
+    assert Trie(new).diff(Trie(old)) == TrieDiff(expected.removed, expected.added, expected.prefixes, [])
+
+
+class Untouchable(dict):
+    """A trie node that fails the test when it is compared or walked."""
+
+    def __eq__(self, other: object) -> bool:
+        raise AssertionError("Identical subtree was compared")
+
+    def __ne__(self, other: object) -> bool:
+        raise AssertionError("Identical subtree was compared")
+
+    def keys(self):  # type: ignore
+        raise AssertionError("Identical subtree was walked")
+
+    def items(self):  # type: ignore
+        raise AssertionError("Identical subtree was walked")
+
+    def __iter__(self):
+        raise AssertionError("Identical subtree was walked")
+
+    __hash__ = None  # type: ignore
+
+
+def make_untouchable(trie: Trie, char: str) -> None:
+    node = trie._structure[char]
+    untouchable = Untouchable(node)
+    trie._structure[char] = untouchable
+    trie._digests[id(untouchable)] = trie._digests.pop(id(node))
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_trie_diff_skips_identical_subtrees(weighted: bool):
+    values = [f"a{i}" for i in range(100)]
+    weights = list(range(len(values) + 1)) if weighted else None
+    old = Trie(values + ["bar"], weights=weights)
+    new = Trie(values + ["baz"], weights=weights)
+    make_untouchable(old, "a")
+    make_untouchable(new, "a")
+
+    assert old.diff(new) == TrieDiff(["baz"], ["bar"], ["ba"], [])
+
+
+def test_trie_diff_weights():
+    old = Trie(["foo", "foobar", "bar"], weights=[1, 2, 3])
+    new = Trie(["foo", "foobar", "bar", "baz"], weights=[1, 5, 3, 1])
+
+    assert old.diff(new) == TrieDiff(["baz"], [], ["ba", "foobar"], ["foobar"])
+    assert Trie(["foo", "bar"]).diff(Trie(["foo", "bar"], weights=[1, 2])) == TrieDiff([], [], ["bar"], ["bar"])
+    assert Trie(["foo", "bar"]).diff(Trie(["foo", "bar"], weights=[1, 1])) == TrieDiff([], [], [], [])
+
+
+def test_trie_stats():
+    trie = Trie(["foo", "foobar", "foobaz", "bar", "bat"])
+    assert trie.stats() == TrieStats(5, 11, 6, {0: 4, 1: 5, 2: 3}, 21, 1, 1)
+
+
+@pytest.mark.parametrize("capturing", [None, True, False])
+@pytest.mark.parametrize("boundary", [True, False])
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        [""],
+        ["", "foo"],
+        ["a", "b"],
+        ["a", "ab", "ac", "abd", "abe"],
+        ["a", "abc", "abd", "abcef", "abceg", "abcdx"],
+        ["f.123", "f.$56", "x-", "x]", "x|y", "x^"],
+    ],
+)
+def test_trie_stats_pattern(values: list[str], boundary: bool, capturing: t.Optional[bool]):
+    trie = Trie(values)
+    stats = trie.stats(boundary, capturing)
+    pattern = trie.to_regex(boundary, capturing)
+
+    nesting = level = 0
+
+    for token in re.findall(r"\\.|[()]", pattern):
+        level += {"(": 1, ")": -1}.get(token, 0)
+        nesting = max(nesting, level)
+
+    assert stats.length == len(pattern)
+    assert stats.groups == pattern.count("(")
+    assert stats.nesting == nesting
+    assert stats.depth == max((len(v) for v in trie.members), default=0)
+    assert stats.nodes == len({v[:i] for v in trie.members for i in range(1, len(v) + 1)})
+
+
+def test_trie_weight():
+    trie = Trie(["foo", "foobar", "bar"], weights=[1, 2, 4])
+    trie.add("bar", 3)
+
+    assert trie.weight() == 10
+    assert trie.weight("f") == 3
+    assert trie.weight("foob") == 2
+    assert trie.weight("bar") == 7
+    assert trie.weight("baz") == 0
+
+
 def test_trie_invalid():
     assert Trie([None]).invalid == [None]  # type:ignore
 
@@ -41,6 +207,11 @@ def test_to_regex():
     assert pattern == r"\b(bar|foo)\b"
 
 
+def test_to_regex_order():
+    pattern = Trie(["foo", "bar"], weights=[2, 1]).to_regex(order="frequency")
+    assert pattern == r"foo|bar"
+
+
 @pytest.mark.parametrize("silent", [True, False])
 def test_trie__coerce(silent: bool):
     values = ["foo", 1, 1.0, None]
@@ -101,6 +272,41 @@ def test_regex_pattern(
     assert all(re.match(regex.pattern, v) is not None for v in trie.members)
 
 
+def test_regex_order_invalid():
+    with pytest.raises(ValueError, match=r'Unknown order "foo"'):
+        Regex(Trie(), order="foo")  # type:ignore
+
+
+@pytest.mark.parametrize(
+    ("weights", "expected"),
+    [
+        ([1, 1, 1, 1, 1, 1], r"x(?:yz|a)|ba[rt]|c"),
+        ([1, 1, 1, 1, 5, 1], r"x(?:a|yz)|ba[rt]|c"),
+        ([1, 1, 9, 1, 1, 1], r"c|x(?:yz|a)|ba[rt]"),
+        ([1, 1, 1, 1, 1, 4], r"x(?:yz|a)|ba[rt]|c"),
+        ([1, 3, 1, 1, 1, 1], r"ba[tr]|x(?:yz|a)|c"),
+    ],
+)
+def test_regex_order_frequency(weights: list[int], expected: str):
+    trie = Trie(["bar", "bat", "c", "xyz", "xa", "xyz"], weights=weights)
+    regex = Regex(trie, order="frequency")
+
+    assert regex.pattern == expected
+    assert all(re.fullmatch(regex.pattern, v) is not None for v in trie.members)
+
+
+def test_regex_order_frequency_char_class():
+    trie = Trie(["ab", "ac", "b", "c"], weights=[2, 2, 1, 1])
+    regex = Regex(trie, order="frequency")
+
+    assert regex.pattern == r"a[bc]|[bc]"
+
+    trie.add("c", 3)
+    regex = Regex(trie, order="frequency")
+
+    assert regex.pattern == r"[cb]|a[bc]"
+
+
 def test_regex__construct():
     trie = Trie(["foo", "bar", "ba$", "ba-", "foos", "x.y"])
     regex = Regex(trie)
@@ -6,3 +6,5 @@ The triex public API
 
 from .triex import Trie as Trie
 from .triex import Regex as Regex
+from .triex import TrieDiff as TrieDiff
+from .triex import TrieStats as TrieStats
@@ -5,6 +5,7 @@ The command-line interface for triex
 """
 
 import logging
+import math
 from pathlib import Path
 import sys
 import typing as t
@@ -12,7 +13,7 @@ import typing as t
 import click
 from clickext import ClickextCommand, ClickextGroup, verbose_option
 
-from .triex import Trie
+from .triex import ORDERS, Order, Trie, TrieStats
 
 
 __all__ = ["cli"]
@@ -21,7 +22,9 @@ __all__ = ["cli"]
 logger = logging.getLogger(__package__)
 
 
-@click.group(cls=ClickextGroup, global_opts=["verbose"], shared_params=["boundary", "capture", "delimiter"])
+@click.group(
+    cls=ClickextGroup, global_opts=["verbose"], shared_params=["boundary", "capture", "delimiter", "order", "weighted"]
+)
 @click.version_option(package_name="py_triex")
 @click.option(
     "--boundary",
@@ -48,16 +51,95 @@ logger = logging.getLogger(__package__)
     help='The character(s) that separate values in the input. [default: "\\n"]',
     type=click.STRING,
 )
+@click.option(
+    "--order",
+    "-r",
+    default="lexical",
+    show_default=True,
+    help="The order of alternates in the pattern. Frequency order places the highest weighted alternates first.",
+    type=click.Choice(ORDERS),
+)
+@click.option(
+    "--weighted",
+    "-w",
+    is_flag=True,
+    default=False,
+    help='Read a weight for each value from the input ("value<TAB>weight"). Values without a weight default to 1.',
+)
 @verbose_option(logger)
 def cli() -> None:
     """A tool to generate semi-minimized regular expression alternations."""
     logger.debug("%s started", __package__)
 
 
+def _parse_input(
+    raw_data: str, delimiter: t.Optional[str], weighted: bool
+) -> tuple[list[str], t.Optional[list[float]]]:
+    """Split raw input into values and, optionally, their weights.
+
+    :param raw_data: The raw input.
+    :param delimiter: The character(s) that separate values in the input. Values are separated by lines when `None`.
+    :param weighted: Whether each value is followed by a tab and its weight.
+
+    :raises click.ClickException: When a weight is not a finite, non-negative number.
+    """
+    data = raw_data.split(delimiter) if delimiter else raw_data.splitlines()
+
+    if not weighted:
+        return data, None
+
+    values = []
+    weights = []
+
+    for item in data:
+        value, separator, weight = item.rpartition("\t")
+
+        if not separator:
+            value, weight = item, "1"
+
+        try:
+            number = float(weight)
+        except ValueError:
+            number = math.nan
+
+        if not math.isfinite(number) or number < 0:
+            raise click.ClickException(f'Invalid weight "{weight}" for value "{value}"')
+
+        values.append(value)
+        weights.append(number)
+
+    return values, weights
+
+
+def _format_stats(stats: TrieStats) -> str:
+    """Format trie statistics for display.
+
+    :param stats: The trie statistics.
+    """
+    lines = [f"{field}: {value}" for field, value in stats._asdict().items() if field != "branching"]
+    lines.append(f"branching: {', '.join(f'{k}={v}' for k, v in stats.branching.items())}")
+    return "\n".join(lines)
+
+
 @cli.command(cls=ClickextCommand)
 @click.option("--in", "-i", "in_", default="-", show_default=True, help="The input file.", type=click.File())
 @click.option("--out", "-o", "out_", default="-", show_default=True, help="The output file.", type=click.File(mode="w"))
-def convert(in_: t.IO, out_: t.IO, boundary: bool, capture: t.Optional[bool], delimiter: t.Optional[str]) -> None:
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Output the trie and pattern statistics (e.g., pattern length) instead of generating the pattern.",
+)
+def convert(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    in_: t.IO,
+    out_: t.IO,
+    dry_run: bool,
+    boundary: bool,
+    capture: t.Optional[bool],
+    delimiter: t.Optional[str],
+    order: Order,
+    weighted: bool,
+) -> None:
     """Convert input to a regex pattern."""
 
     logger.debug("Preparing input data")
@@ -72,14 +154,18 @@ def convert(in_: t.IO, out_: t.IO, boundary: bool, capture: t.Optional[bool], de
     if not raw_data:
         raise click.ClickException("No input provided")
 
-    data = raw_data.split(delimiter) if delimiter else raw_data.splitlines()
+    data, weights = _parse_input(raw_data, delimiter, weighted)
 
     logger.debug("Generating trie")
-    trie = Trie(data)
+    trie = Trie(data, weights=weights)
     logger.debug("Trie created with %s value(s)", len(trie.members))
 
-    logger.debug("Generating regex")
-    regex = trie.to_regex(boundary, capture)
+    if dry_run:
+        logger.debug("Measuring regex")
+        regex = _format_stats(trie.stats(boundary, capture))
+    else:
+        logger.debug("Generating regex")
+        regex = trie.to_regex(boundary, capture, order)
 
     if out_ is not sys.stdout:
         logger.debug("Ensuring output directory exists")
@@ -98,15 +184,30 @@ def convert(in_: t.IO, out_: t.IO, boundary: bool, capture: t.Optional[bool], de
     help="The suffix to add to the output file names.",
     type=click.STRING,
 )
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Show the trie and pattern statistics (e.g., pattern length) for each file instead of writing patterns.",
+)
 @click.argument("files", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
-def batch(
-    suffix: str, files: tuple[Path], capture: t.Optional[bool], boundary: bool, delimiter: t.Optional[str]
+def batch(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    suffix: str,
+    dry_run: bool,
+    files: tuple[Path],
+    capture: t.Optional[bool],
+    boundary: bool,
+    delimiter: t.Optional[str],
+    order: Order,
+    weighted: bool,
 ) -> None:
     """Batch convert file contents to patterns.
 
     Patterns will be written to separate files with the --suffix value inserted before the extension:
 
     source.txt > source.<suffix>.txt
+
+    With --dry-run, statistics for each pattern are shown instead and no files are written.
     """
 
     logger.debug("Converting %s files", len(files))
@@ -120,16 +221,75 @@ def batch(
             logger.warning("File is empty")
             continue
 
-        data = raw_data.split(delimiter) if delimiter else raw_data.splitlines()
+        data, weights = _parse_input(raw_data, delimiter, weighted)
 
         logger.debug("Generating trie")
-        trie = Trie(data)
+        trie = Trie(data, weights=weights)
         logger.debug("Trie created with %s value(s)", len(trie.members))
 
+        if dry_run:
+            logger.debug("Measuring regex")
+            click.echo(f"file: {file.name}\n{_format_stats(trie.stats(boundary, capture))}")
+            continue
+
         logger.debug("Generating regex")
-        regex = trie.to_regex(boundary, capture)
+        regex = trie.to_regex(boundary, capture, order)
 
         out_ = file.with_name(f"{file.stem}.{suffix}{file.suffix}")
 
         logger.debug("Writing regex to %s", out_.name)
         out_.write_text(f"{regex}\n", encoding="utf8")
+
+
+@cli.command(cls=ClickextCommand)
+@click.option(
+    "--prefixes",
+    "-p",
+    is_flag=True,
+    default=False,
+    help='Show the prefixes where the inputs diverge, anchored with "^", instead of the changed values.',
+)
+@click.argument("old", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def diff(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    prefixes: bool, old: Path, new: Path, delimiter: t.Optional[str], weighted: bool
+) -> None:
+    """Show the values added, removed and reweighted between two inputs.
+
+    Removed values are prefixed with "-", added values with "+" and values whose weight changed (with --weighted) with
+    "~":
+
+    \b
+    -removed
+    +added
+    ~reweighted
+    """
+    tries = []
+
+    for file in (old, new):
+        logger.debug("Generating trie from %s", file.name)
+
+        raw_data = file.read_text(encoding="utf8").rstrip()
+        data, weights = _parse_input(raw_data, delimiter, weighted) if raw_data else ([], None)
+
+        trie = Trie(data, weights=weights)
+        logger.debug("Trie created with %s value(s)", len(trie.members))
+        tries.append(trie)
+
+    logger.debug("Comparing tries")
+    changes = tries[0].diff(tries[1])
+
+    if prefixes:
+        for prefix in changes.prefixes:
+            click.echo(f"^{prefix}")
+        return
+
+    lines = [(v, "-") for v in changes.removed] + [(v, "+") for v in changes.added]
+    lines.extend((v, "~") for v in changes.reweighted)
+
+    for value, change in sorted(lines):
+        click.echo(f"{change}{value}")
+
+
+# The pattern options are shared with every subcommand by the group but do not apply to diff
+diff.params = [param for param in diff.params if param.name not in ("boundary", "capture", "order")]
@@ -4,43 +4,133 @@ triex
 A tool to generate semi-minimized regular expression alternations.
 """
 
+import math
 import typing as t
 
 
 TrieNode: t.TypeAlias = dict[str, "TrieNode"]
 DataValue: t.TypeAlias = int | float | str
 DataInput: t.TypeAlias = t.Optional[t.Sequence[DataValue] | DataValue]
+WeightValue: t.TypeAlias = int | float
+WeightInput: t.TypeAlias = t.Optional[t.Sequence[WeightValue] | WeightValue]
+Order: t.TypeAlias = t.Literal["lexical", "frequency"]
+
+ORDERS: tuple[Order, ...] = t.get_args(Order)
+CONTROL_CHARS = r".^$*+?()[{\|"
+CHAR_CLASS_CONTROL_CHARS = r"^-]\\"
+
+
+class TrieDiff(t.NamedTuple):
+    """The differences between two tries.
+
+    :param added: A sorted list of members only in the other trie.
+    :param removed: A sorted list of members only in the original trie.
+    :param prefixes: A sorted list of the prefixes where the tries diverge, including members whose weight changed.
+    Patterns for these prefixes, and any prefix leading to them, are affected by the changes; everything else is
+    unchanged.
+    :param reweighted: A sorted list of members in both tries with a different weight.
+    """
+
+    added: list[str]
+    removed: list[str]
+    prefixes: list[str]
+    reweighted: list[str]
+
+
+class TrieStats(t.NamedTuple):
+    """Statistics describing a trie and the regex pattern generated from it.
+
+    :param members: The number of members in the trie.
+    :param nodes: The number of character nodes in the trie.
+    :param depth: The length of the longest member.
+    :param branching: A histogram mapping a number of child nodes to the count of nodes with that many children.
+    :param length: The length of the generated pattern.
+    :param groups: The number of groups in the generated pattern.
+    :param nesting: The deepest group nesting level in the generated pattern.
+    """
+
+    members: int
+    nodes: int
+    depth: int
+    branching: dict[int, int]
+    length: int
+    groups: int
+    nesting: int
 
 
 class Trie:
     """Trie data structure.
 
     Create and manipulate a trie representation of one or more strings. Duplicates are pruned before insertion,
-    and members are cached to allow insertion without re-generating the entire trie.
+    and members are cached to allow insertion without re-generating the entire trie. Members may carry a weight (e.g.,
+    a hit count) so patterns can be ordered by frequency; each occurrence of a value added without a weight counts as 1.
 
     :param data: A value or `list` of values to be added to the trie. Values may be a `str`, `int` and/or `float`.
     :param silent: Indicates whether invalid values should be skipped silently during insertion or raise an Exception.
+    :param weights: A weight or `list` of weights corresponding to `data`.
     """
 
-    def __init__(self, data: DataInput = None, silent: bool = True):
+    def __init__(self, data: DataInput = None, silent: bool = True, weights: WeightInput = None):
         self._structure: TrieNode = {}
         self._invalid: list[t.Any] = []
         self._members: list[str] = []
+        self._weights: dict[str, float] = {}
+        self._digests: dict[int, int] = {}
         self.silent = silent
 
-        self.add(data)
+        self.add(data, weights)
+
+    def __getstate__(self) -> dict[str, t.Any]:
+        state = self.__dict__.copy()
+        del state["_digests"]  # Keyed by node `id`, rebuilt on unpickle/copy
+        return state
 
-    def add(self, data: DataInput) -> None:
+    def __setstate__(self, state: dict[str, t.Any]) -> None:
+        self.__dict__.update(state)
+        self._digests = {}
+
+        for member in self._members:
+            self._digest(member, hash((member, self._weights.get(member, 1))))
+
+    def add(self, data: DataInput, weights: WeightInput = None) -> None:
         """Add values to the trie
 
+        The weights of every occurrence of a value are accumulated, with each occurrence counting as 1 when `weights`
+        is omitted. Only weights other than 1 are recorded.
+
         :param data: A value or list of values to add to the trie.
+        :param weights: A weight or list of weights corresponding to `data`.
+
+        :raises ValueError: When the number of weights does not match the number of values, or a weight is negative or
+        not finite.
         """
         if data is None:
             data = []
         elif isinstance(data, DataValue) or not isinstance(data, t.Sequence):
             data = [data]
 
-        processed_data = self._prune(self._coerce(data))
+        if isinstance(weights, WeightValue):
+            weights = [weights]
+
+        if weights is not None:
+            if len(weights) != len(data):
+                raise ValueError(f"Expected {len(data)} weight(s), got {len(weights)}")
+
+            if not all(math.isfinite(w) for w in weights):
+                raise ValueError("Weights must be finite")
+
+            if any(w < 0 for w in weights):
+                raise ValueError("Weights cannot be negative")
+
+        coerced_data = self._coerce(data)
+        processed_data = self._prune(coerced_data)
+
+        if weights is None:
+            weights = [1] * len(coerced_data)
+        else:
+            weights = [w for v, w in zip(data, weights) if isinstance(v, DataValue)]
+
+        self._weigh(coerced_data, weights, set(processed_data))
         self._insert(processed_data)
 
     @property
@@ -58,15 +148,97 @@ class Trie:
         """The trie data structure."""
         return self._structure
 
-    def to_regex(self, boundary: bool = False, capturing: t.Optional[bool] = None) -> str:
+    def diff(self, other: "Trie") -> TrieDiff:
+        """Compare the trie to another trie.
+
+        Both structures are walked together. Every node keeps a digest of the members (and their weights) below it,
+        updated as values are added, so identical subtrees are skipped in constant time and near-identical tries are
+        compared in time proportional to the changes.
+
+        :param other: The trie to compare against (e.g., a newer snapshot of the same values).
+        """
+        changes = TrieDiff([], [], [], [])
+        other_weights = other._weights  # pylint: disable=protected-access
+        other_digests = other._digests  # pylint: disable=protected-access
+
+        if self._digests.get(id(self._structure), 0) != other_digests.get(id(other.structure), 0):
+            self._diff(self._structure, other.structure, other_weights, other_digests, "", changes)
+
+        return TrieDiff(
+            sorted(changes.added), sorted(changes.removed), sorted(changes.prefixes), sorted(changes.reweighted)
+        )
+
+    def weight(self, prefix: str = "") -> float:
+        """Get the aggregated weight of all members starting with a prefix.
+
+        :param prefix: The prefix of the subtree. The total weight of the trie is returned when empty.
+        """
+        node = self._structure
+
+        for char in prefix:
+            if char not in node:
+                return 0
+
+            node = node[char]
+
+        return self._count(node) + sum(w - 1 for m, w in self._weights.items() if m.startswith(prefix))
+
+    def stats(self, boundary: bool = False, capturing: t.Optional[bool] = None) -> TrieStats:
+        """Measure the trie and the regex pattern it would generate without generating the pattern.
+
+        The pattern metrics are exact and do not depend on the alternate order.
+
+        :param boundary: Indicates whether the regex should be surrounded by boundary ('\b') tokens.
+        :param capturing: Indicates whether the pattern should be in a capturing (`True`) or non-capturing (`False`)
+        group. When value is `None` the pattern will not be grouped unless `boundary` is `True` in which case it will be
+        made a non-capturing group so the boundary tokens apply to all items in the pattern.
+        """
+        branching: dict[int, int] = {}
+        length, groups, nesting, nodes, depth = self._measure(self._structure, branching, is_outer=True)
+
+        if boundary and capturing is None:
+            capturing = False
+
+        if capturing is not None:
+            length += 2 if capturing else 4
+            groups += 1
+            nesting += 1
+
+        if boundary:
+            length += 4
+
+        return TrieStats(len(self._members), nodes, depth, dict(sorted(branching.items())), length, groups, nesting)
+
+    def to_regex(self, boundary: bool = False, capturing: t.Optional[bool] = None, order: Order = "lexical") -> str:
         """Convert the trie to a regular expression.
 
         :param boundary: Indicates whether the regex should be surrounded by boundary ('\b') tokens.
         :param capturing: Indicates whether the pattern should be in a capturing (`True`) or non-capturing (`False`)
         group. When value is `None` the pattern will not be grouped unless `boundary` is `True` in which case it will be
         made a non-capturing group so the boundary tokens apply to all items in the pattern.
+        :param order: How alternates are ordered. `"lexical"` sorts alternates by character, `"frequency"` places the
+        alternates with the highest weight first.
         """
-        return Regex(self, boundary=boundary, capturing=capturing).pattern
+        return Regex(self, boundary=boundary, capturing=capturing, order=order).pattern
+
+    def _aggregate(self) -> dict[int, float]:
+        """Aggregate the weights of the members under each node of the trie, keyed by node `id`.
+
+        Members are counted once per node and only the members with recorded weights are walked again to adjust the
+        totals, so no prefix strings are built.
+        """
+        totals: dict[int, float] = {}
+        self._count(self._structure, totals)
+
+        for member, weight in self._weights.items():
+            node = self._structure
+            totals[id(node)] += weight - 1
+
+            for char in member:
+                node = node[char]
+                totals[id(node)] += weight - 1
+
+        return totals
 
     def _coerce(self, data: t.Sequence[DataValue]) -> list[str]:
         """Coerce raw values to string objects.
@@ -90,23 +262,175 @@ class Trie:
 
         return coerced
 
+    def _collect(self, data: TrieNode, prefix: str) -> list[str]:
+        """Collect the members in a trie structure.
+
+        :param data: A trie data structure.
+        :param prefix: The characters leading to `data` from the root of the trie.
+        """
+        members = []
+        stack = [(data, prefix)]
+
+        while stack:
+            node, node_prefix = stack.pop()
+
+            for char, child_node in node.items():
+                if char == "":
+                    members.append(node_prefix)
+                else:
+                    stack.append((child_node, node_prefix + char))
+
+        return members
+
+    def _count(self, data: TrieNode, totals: t.Optional[dict[int, float]] = None) -> int:
+        """Count the members in a trie structure.
+
+        :param data: A trie data structure.
+        :param totals: A map to collect the member count of each node, keyed by node `id`.
+        """
+        count = 0
+
+        for char, child_node in data.items():
+            count += 1 if char == "" else self._count(child_node, totals)
+
+        if totals is not None:
+            totals[id(data)] = count
+
+        return count
+
+    def _diff(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        data: TrieNode,
+        other: TrieNode,
+        other_weights: dict[str, float],
+        other_digests: dict[int, int],
+        prefix: str,
+        changes: TrieDiff,
+    ) -> None:
+        """Recursively compare two trie structures.
+
+        :param data: The original trie data structure.
+        :param other: The trie data structure to compare against.
+        :param other_weights: The recorded member weights of the trie `other` belongs to.
+        :param other_digests: The node digests of the trie `other` belongs to.
+        :param prefix: The characters leading to `data` and `other` from the root of the tries.
+        :param changes: The lists to collect the differences in.
+        """
+        diverged = False
+
+        for char in data.keys() | other.keys():
+            if char not in other:
+                changes.removed.extend(self._collect({char: data[char]}, prefix))
+                diverged = True
+            elif char not in data:
+                changes.added.extend(self._collect({char: other[char]}, prefix))
+                diverged = True
+            elif char == "":
+                if self._weights.get(prefix, 1) != other_weights.get(prefix, 1):
+                    changes.reweighted.append(prefix)
+                    diverged = True
+            elif self._digests[id(data[char])] != other_digests[id(other[char])]:
+                self._diff(data[char], other[char], other_weights, other_digests, prefix + char, changes)
+
+        if diverged:
+            changes.prefixes.append(prefix)
+
+    def _digest(self, value: str, digest: int) -> None:
+        """Fold a digest into the digests of every node on the path of a member.
+
+        Node digests are the XOR of `hash((member, weight))` for every member below the node, so a member can be added,
+        or its weight changed, by folding in the old and new hashes.
+
+        :param value: A member of the trie.
+        :param digest: The hash to fold into the digests.
+        """
+        node = self._structure
+        self._digests[id(node)] = self._digests.get(id(node), 0) ^ digest
+
+        for char in value:
+            node = node[char]
+            self._digests[id(node)] = self._digests.get(id(node), 0) ^ digest
+
     def _insert(self, data: list[str]) -> None:
         """Insert values in the trie.
 
         :param data: A list of string objects.
         """
+        digests = self._digests
+
         for value in data:
             node = self._structure
+            digest = hash((value, self._weights.get(value, 1)))
+            digests[id(node)] = digests.get(id(node), 0) ^ digest
 
             for char in value:
                 if not char in node:
                     node[char] = {}
 
                 node = node[char]
+                digests[id(node)] = digests.get(id(node), 0) ^ digest
 
             node[""] = {}
             self._members.append(value)
 
+    def _measure(  # pylint: disable=too-many-locals
+        self, data: TrieNode, branching: dict[int, int], is_outer: bool = False
+    ) -> tuple[int, int, int, int, int]:
+        """Recursively measure a trie structure and the pattern `Regex` would construct from it.
+
+        Mirrors `Regex._construct`, returning the pattern length, group count and group nesting level along with the
+        node count and depth of the structure.
+
+        :param data: A trie data structure.
+        :param branching: A histogram to collect the number of child nodes of each node.
+        :param is_outer: Whether the method call is the outermost in the recursive stack.
+        """
+        children = [char for char in data if char]
+        branching[len(children)] = branching.get(len(children), 0) + 1
+
+        length = groups = nesting = depth = 0
+        nodes = len(children)
+        alternates_count = 0
+        char_class_count = 0
+
+        for char in children:
+            child_length, child_groups, child_nesting, child_nodes, child_depth = self._measure(data[char], branching)
+
+            if child_length:
+                length += child_length + (2 if char in CONTROL_CHARS else 1)
+                alternates_count += 1
+            else:
+                length += 2 if char in CHAR_CLASS_CONTROL_CHARS else 1
+                char_class_count += 1
+
+            groups += child_groups
+            nesting = max(nesting, child_nesting)
+            nodes += child_nodes
+            depth = max(depth, child_depth + 1)
+
+        if char_class_count > 1:
+            length += 2
+
+        count = alternates_count + (1 if char_class_count else 0)
+
+        if count > 1:
+            length += count - 1
+
+            if not is_outer:
+                length += 4
+                groups += 1
+                nesting += 1
+
+        if "" in data and children:
+            if alternates_count < 1:
+                length += 1
+            else:
+                length += 5
+                groups += 1
+                nesting += 1
+
+        return length, groups, nesting, nodes, depth
+
     def _prune(self, data: list[str]) -> list[str]:
         """Prune duplicate values from the input data and values in `self.members`.
 
@@ -115,6 +439,30 @@ class Trie:
         data = list(set(data))
         return [v for v in data if v not in self.members]
 
+    def _weigh(self, data: list[str], weights: list[WeightValue], new: set[str]) -> None:
+        """Accumulate member weights.
+
+        Members with a weight of 1 are not recorded, so tries without repeated or weighted values record nothing.
+
+        :param data: A list of string objects.
+        :param weights: A list of weights corresponding to `data`.
+        :param new: The values in `data` that are not yet members of the trie. Their digests are added on insertion.
+        """
+        pending = set(new)
+
+        for value, weight in zip(data, weights):
+            current = self._weights.get(value, 0 if value in pending else 1)
+            total = current + weight
+            pending.discard(value)
+
+            if total == 1:
+                self._weights.pop(value, None)
+            else:
+                self._weights[value] = total
+
+            if value not in new:
+                self._digest(value, hash((value, current)) ^ hash((value, total)))
+
 
 class Regex:  # pylint: disable=too-few-public-methods
     """A regular expression generated from a trie data structure.
@@ -124,15 +472,31 @@ class Regex:  # pylint: disable=too-few-public-methods
     :param capturing: Indicates whether the pattern should be in a capturing (`True`) or non-capturing (`False`) group.
     When value is `None` the pattern will not be grouped unless `boundary` is `True` in which case it will be made a
     non-capturing group so the boundary tokens apply to all items in the pattern.
+    :param order: How alternates are ordered. `"lexical"` sorts alternates by character, `"frequency"` places the
+    alternates with the highest aggregated trie weight first so a backtracking engine tries the most common branches
+    before the others.
+
+    :raises ValueError: When `order` is not a supported ordering.
     """
 
-    def __init__(self, trie: Trie, boundary: bool = False, capturing: t.Optional[bool] = None):
+    def __init__(
+        self, trie: Trie, boundary: bool = False, capturing: t.Optional[bool] = None, order: Order = "lexical"
+    ):
+        if order not in ORDERS:
+            raise ValueError(f'Unknown order "{order}"')
+
         self.boundary = boundary
 
         if boundary and capturing is None:
             capturing = False
 
         self.capturing = capturing
+        self.order = order
+
+        self._weights: dict[int, float] = {}
+
+        if order == "frequency":
+            self._weights = trie._aggregate()  # pylint: disable=protected-access
 
         self._pattern = self._construct(trie.structure, is_outer=True)
 
@@ -165,7 +529,7 @@ class Regex:  # pylint: disable=too-few-public-methods
         if "" in node and len(node) == 1:
             return ""
 
-        for child_node in sorted(node):
+        for child_node in self._sort(node):
             if len(node[child_node]) > 0:
                 children = self._construct(node[child_node])
 
@@ -182,7 +546,8 @@ class Regex:  # pylint: disable=too-few-public-methods
 
         if char_class:
             char_class = self._make_char_class(char_class)
-            alternates.append(char_class)
+            index = self._rank_char_class(node) if self.order == "frequency" else len(alternates)
+            alternates.insert(index, char_class)
 
         alternates = self._make_alternates(alternates, is_outer)
 
@@ -197,7 +562,7 @@ class Regex:  # pylint: disable=too-few-public-methods
         :param char: The character to escape.
         :param char_class: Whether `character` is part of a character class.
         """
-        control_chars = r"^-]\\" if char_class else r".^$*+?()[{\|"
+        control_chars = CHAR_CLASS_CONTROL_CHARS if char_class else CONTROL_CHARS
 
         if char in control_chars:
             return rf"\{char}"
@@ -239,3 +604,36 @@ class Regex:  # pylint: disable=too-few-public-methods
         :param count: The number of non-character class alternates.
         """
         return rf"{value}?" if count < 1 else rf"(?:{value})?"
+
+    def _rank_char_class(self, data: TrieNode) -> int:
+        """Find the position of the character class among the alternates of a trie node when ordered by weight.
+
+        The character class is weighted by the sum of its characters and placed after alternates of equal weight.
+
+        :param data: A trie data structure.
+        """
+        alternates_weights = []
+        char_class_weight: float = 0
+
+        for char, child_node in data.items():
+            if not char:
+                continue
+
+            if "" in child_node and len(child_node) == 1:
+                char_class_weight += self._weights[id(child_node)]
+            else:
+                alternates_weights.append(self._weights[id(child_node)])
+
+        return sum(1 for w in alternates_weights if w >= char_class_weight)
+
+    def _sort(self, data: TrieNode) -> list[str]:
+        """Sort the keys of a trie node according to `self.order`.
+
+        Frequency ordering uses the character as a tiebreaker so patterns are deterministic.
+
+        :param data: A trie data structure.
+        """
+        if self.order == "frequency":
+            return sorted(data, key=lambda char: (-self._weights.get(id(data[char]), 0), char))
+
+        return sorted(data)